@@ -4,12 +4,18 @@ Wrappers to make JSON returned by kubectl easier to work with.
 
 from abc import abstractmethod
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Optional
 
 from kugl.util import parse_size, parse_cpu
 
 # What container name is considered the "main" container, if present
-MAIN_CONTAINERS = ["main", "notebook", "app"]
+MAIN_CONTAINERS = frozenset(["main", "notebook", "app"])
+
+# Job status implied by a job condition type, if the condition status is "True"; see JobHelper.status
+_TRUE_CONDITION_STATUS = {"Suspended": "Suspended", "Complete": "Complete"}
+# Job status implied by a job condition type, whatever the condition status
+_ANY_CONDITION_STATUS = {"FailureTarget": "Failed", "SuccessCriteriaMet": "Complete"}
 
 
 @dataclass
@@ -18,6 +24,8 @@ class Limits:
     A class to hold CPU, GPU and memory resources. This is called "Limits" although it's used for both requests
     and limits, so as not to confuse "resources" with Kubernetes resources in general.
     """
+    # One of these is made per node and per pod; dataclass(slots=True) would need Python 3.10.
+    __slots__ = ("cpu", "gpu", "mem")
     cpu: Optional[float]
     gpu: Optional[float]
     mem: Optional[int]
@@ -37,10 +45,6 @@ class Limits:
             mem = (self.mem or 0) + (other.mem or 0)
         return Limits(cpu, gpu, mem)
 
-    def __radd__(self, other):
-        """Needed to support sum() -- handles 0 as a starting value"""
-        return self if other == 0 else self.__add__(other)
-
     def as_tuple(self):
         return (self.cpu, self.gpu, self.mem)
 
@@ -52,19 +56,23 @@ class Limits:
         """Extract a Limits object from a dictionary, or return an empty one if the dictionary is None.
 
         :param obj: A dictionary with keys "cpu", "nvidia.com/gpu" and "memory" """
+        return Limits(*cls._extract(obj, debug))
+
+    @staticmethod
+    def _extract(obj, debug=None) -> tuple:
+        """Same as extract, but return a (cpu, gpu, mem) tuple."""
         if obj is None:
             if debug:
                 debug("no object provided to requests / limits extractor")
-            return Limits(None, None, None)
+            return None, None, None
         if debug:
             debug("get requests / limits from", obj)
         cpu = parse_cpu(obj.get("cpu"))
         gpu = parse_cpu(obj.get("nvidia.com/gpu"))
         mem = parse_size(obj.get("memory"))
-        result = Limits(cpu, gpu, mem)
         if debug:
-            debug("got", result)
-        return result
+            debug("got", Limits(cpu, gpu, mem))
+        return cpu, gpu, mem
 
 
 class ItemHelper:
@@ -73,12 +81,16 @@ class ItemHelper:
     def __init__(self, obj):
         self.obj = obj
         self.metadata = self.obj.get("metadata", {})
-        self.labels = self.metadata.get("labels", {})
 
     def __getitem__(self, key):
         """Return a key from the object; no default, will error if not present"""
         return self.obj[key]
 
+    @cached_property
+    def labels(self):
+        """Return the object's labels, if any, else an empty dict.  Only the label tables need these."""
+        return self.metadata.get("labels", {})
+
     @property
     def name(self):
         """Return the name of the object from the metadata, or none if unavailable."""
@@ -101,7 +113,18 @@ class Containerized:
         raise NotImplementedError()
 
     def resources(self, tag, debug=None):
-        return sum(Limits.extract(c.get("resources", {}).get(tag), debug) for c in self.containers)
+        """Sum requests or limits across containers.  As with Limits.__add__, a sum is None only if
+        no container has a value for it.  This is done in one pass, without a Limits per container."""
+        cpu = gpu = mem = None
+        for container in self.containers:
+            c, g, m = Limits._extract(container.get("resources", {}).get(tag), debug)
+            if c is not None:
+                cpu = (cpu or 0) + c
+            if g is not None:
+                gpu = (gpu or 0) + g
+            if m is not None:
+                mem = (mem or 0) + m
+        return Limits(cpu, gpu, mem)
 
 
 class PodHelper(ItemHelper, Containerized):
@@ -114,20 +137,19 @@ class PodHelper(ItemHelper, Containerized):
     def is_daemon(self):
         return any(ref.get("kind") == "DaemonSet" for ref in self.metadata.get("ownerReferences", []))
 
-    @property
+    @cached_property
     def containers(self):
         """Return the containers in the pod, if any, else an empty list."""
         return self["spec"].get("containers", [])
 
-    @property
+    @cached_property
     def main(self):
         """Return the main container in the pod, if any, defined as the first container with a name
         in MAIN_CONTAINERS.  If there are none of those, return the first one.
         """
-        if not self.containers:
+        if not (containers := self.containers):
             return None
-        main = next(filter(lambda c: c["name"] in MAIN_CONTAINERS, self.containers), None)
-        return main or self.containers[0]
+        return next((c for c in containers if c["name"] in MAIN_CONTAINERS), containers[0])
 
 
 class JobHelper(ItemHelper, Containerized):
@@ -141,22 +163,19 @@ class JobHelper(ItemHelper, Containerized):
         # https://github.com/kubernetes-client/python/blob/master/kubernetes/docs/V1JobStatus.md
         # and https://kubernetes.io/docs/concepts/workloads/controllers/job/
         for c in status.get("conditions", []):
+            kind = c["type"]
             if c["status"] == "True":
-                if c["type"] == "Failed":
+                if kind == "Failed":
                     return c.get("reason") or "Failed"
-                if c["type"] == "Suspended":
-                    return "Suspended"
-                if c["type"] == "Complete":
-                    return "Complete"
-            if c["type"] == "FailureTarget":
-                return "Failed"
-            if c["type"] == "SuccessCriteriaMet":
-                return "Complete"
+                if result := _TRUE_CONDITION_STATUS.get(kind):
+                    return result
+            if result := _ANY_CONDITION_STATUS.get(kind):
+                return result
         if status.get("active", 0) > 0:
             return "Running"
         return "Unknown"
 
-    @property
+    @cached_property
     def containers(self):
         """Return the containers in the job, if any, else an empty list."""
         return self["spec"]["template"]["spec"].get("containers", [])
@@ -1,13 +1,12 @@
-import json
 import sys
 from os.path import expandvars, expanduser
 from pathlib import Path
 from typing import Union, Optional
 
-import yaml
 from pydantic import model_validator
 
 from kugl.api import resource, fail, run, Resource
+from kugl.util import yaml_load
 
 
 class NonCacheableResource(Resource):
@@ -78,9 +77,5 @@ class ExecResource(Resource):
 
 
 def _parse(text):
-    if not text:
-        return {}
-    if text[0] in "{[":
-        return json.loads(text)
-    return yaml.safe_load(text)
+    return yaml_load(text) if text else {}
 
@@ -5,16 +5,16 @@ NOTE: This is not a good example of how to write user-defined tables.
 FIXME: Remove references to non-API imports.
 FIXME: Don't use ArgumentParser in the API.
 """
-import json
 import os
 from argparse import ArgumentParser
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 
+import orjson
 from pydantic import model_validator
 
 from ..helpers import Limits, ItemHelper, PodHelper, JobHelper
 from kugl.api import table, fail, resource, run, parse_utc, Resource, column
-from kugl.util import WHITESPACE_RE, kube_context
+from kugl.util import kube_context
 
 
 @resource("kubernetes", schema_defaults=["kubernetes"])
@@ -53,58 +53,73 @@ class KubernetesResource(Resource):
     def get_objects(self) -> dict:
         """Fetch resources from Kubernetes using kubectl.
 
+        We shell out to kubectl rather than use the Kubernetes Python client, so that we honor
+        the user's kubeconfig exactly as kubectl does (exec / auth plugins included), and so the
+        pod STATUS column matches what 'kubectl get pods' prints.  The status isn't stored in the
+        pod JSON; kubectl derives it from container states with rules we'd rather not replicate.
+
         :return: JSON as output by "kubectl get {self.name} -o json"
         """
-        unit_testing = "KUGL_UNIT_TESTING" in os.environ
         namespace_flag = ["--all-namespaces"] if self._all_ns else ["-n", self._ns]
-        if self.name == "pods":
-            pod_statuses = {}
-            # Kick off a thread to get pod statuses
-            def _fetch():
-                _, output, _ = run(["kubectl", "get", "pods", *namespace_flag])
-                pod_statuses.update(self._pod_status_from_pod_list(output))
-            status_thread = Thread(target=_fetch, daemon=True)
-            status_thread.start()
+        if self.name != "pods":
+            return self._get_json(namespace_flag)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # Get pod statuses while the JSON is being fetched.  Using a future rather than a bare
+            # thread means a kubectl failure there is re-raised here, not lost.
+            status_future = pool.submit(self._get_pod_statuses, namespace_flag)
             # In unit tests, wait for pod status here so the log order is deterministic.
-            if unit_testing:
-                status_thread.join()
+            if "KUGL_UNIT_TESTING" in os.environ:
+                status_future.result()
+            data = self._get_json(namespace_flag)
+            pod_statuses = status_future.result()
+        # Add pod status to pods, dropping those without one.  This is done here rather than in
+        # PodsTable.make_rows because the cache holds what we return, and other tables (e.g.
+        # pod_labels) must see the same set of pods.
+        items = []
+        for pod in data["items"]:
+            metadata = pod["metadata"]
+            if status := pod_statuses.get((metadata["namespace"], metadata["name"])):
+                pod["kubectl_status"] = status
+                items.append(pod)
+        data["items"] = items
+        return data
+
+    def _get_json(self, namespace_flag: list[str]) -> dict:
+        """Run 'kubectl get ... -o json' and return the parsed result."""
+        # Take stdout as bytes; orjson parses those directly, sparing us a UTF-8 decode of
+        # what can be many megabytes of JSON.
         if self.namespaced:
-            _, output, _ = run(["kubectl", "get", self.name, *namespace_flag, "-o", "json"])
+            _, output, _ = run(["kubectl", "get", self.name, *namespace_flag, "-o", "json"], encoding=None)
         else:
-            _, output, _ = run(["kubectl", "get", self.name, "-o", "json"])
-        data = json.loads(output)
-        if self.name == "pods":
-            # Add pod status to pods
-            if not unit_testing:
-                status_thread.join()
-            def pod_with_updated_status(pod):
-                metadata = pod["metadata"]
-                status = pod_statuses.get(f"{metadata['namespace']}/{metadata['name']}")
-                if status:
-                    pod["kubectl_status"] = status
-                    return pod
-                return None
-            data["items"] = list(filter(None, map(pod_with_updated_status, data["items"])))
-        return data
+            _, output, _ = run(["kubectl", "get", self.name, "-o", "json"], encoding=None)
+        return orjson.loads(output)
+
+    def _get_pod_statuses(self, namespace_flag: list[str]) -> dict[tuple[str, str], str]:
+        """Run 'kubectl get pods' and return the STATUS column as parsed by _pod_status_from_pod_list."""
+        _, output, _ = run(["kubectl", "get", "pods", *namespace_flag])
+        return self._pod_status_from_pod_list(output)
 
-    def _pod_status_from_pod_list(self, output) -> dict[str, str]:
+    def _pod_status_from_pod_list(self, output) -> dict[tuple[str, str], str]:
         """
-        Convert the tabular output of 'kubectl get pods' to JSON.
-        :return: a dict mapping "namespace/name" to status
+        Convert the tabular output of 'kubectl get pods' to a dict.
+        :return: a dict mapping (namespace, name) to status
         """
-        rows = [WHITESPACE_RE.split(line.strip()) for line in output.strip().split("\n")]
-        if len(rows) < 2:
+        lines = [line for line in output.splitlines() if line and not line.isspace()]
+        if len(lines) < 2:
             return {}
-        header, rows = rows[0], rows[1:]
+        header = lines[0].split()
         name_index = header.index("NAME")
         status_index = header.index("STATUS")
+        namespace_index = header.index("NAMESPACE") if self._all_ns else 0
+        # Only split as far as the columns we need; later ones like RESTARTS may contain spaces.
+        maxsplit = max(name_index, status_index, namespace_index) + 1
+        rows = [line.split(None, maxsplit) for line in lines[1:]]
         # It would be nice if 'kubectl get pods' printed the UID, but it doesn't, so use
-        # "namespace/name" as the key.  (Can't use a tuple since this has to be JSON-dumped.)
+        # (namespace, name) as the key.  This is only used in-process, so a tuple is fine.
         if self._all_ns:
-            namespace_index = header.index("NAMESPACE")
-            return {f"{row[namespace_index]}/{row[name_index]}": row[status_index] for row in rows}
+            return {(row[namespace_index], row[name_index]): row[status_index] for row in rows}
         else:
-            return {f"{self._ns}/{row[name_index]}": row[status_index] for row in rows}
+            return {(self._ns, row[name_index]): row[status_index] for row in rows}
 
 
 @table(schema="kubernetes", name="nodes", resource="nodes")
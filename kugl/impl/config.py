@@ -192,13 +192,17 @@ def parse_model(model_class, root: dict) -> Tuple[object, list[str]]:
         return None, [f"{error_location(err)}: {err['msg']}" for err in e.errors()]
 
 # FIXME use typevars
-def parse_file(model_class, path: ConfigPath) -> Tuple[object, list[str]]:
+def parse_file(model_class, path: ConfigPath, default_if_missing: bool = True) -> Tuple[object, list[str]]:
     """Parse a configuration file into a model instance, handling edge cases.
 
+    :param default_if_missing: If the file doesn't exist, return a default model instance when
+        this is true, else return (None, None) so the caller can tell the file was missing.
     :return: Same as parse_model."""
-    if not path.exists():
-        return model_class(), None
-    if path.is_world_writeable():
+    try:
+        st = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return (model_class() if default_if_missing else None), None
+    if path.is_world_writeable(st):
         return None, [f"{path} is world writeable, refusing to run"]
-    return parse_model(model_class, path.parse_yaml() or {})
+    return parse_model(model_class, path.parse_yaml(st) or {})
 
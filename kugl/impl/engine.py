@@ -188,6 +188,7 @@ class DataCache:
         self.cache_path(ref).write_text(json.dumps(data))
 
     def load(self, ref: ResourceRef) -> dict:
+        # Use the same JSON library as dump, so values like NaN and very large ints round-trip.
         return json.loads(self.cache_path(ref).read_text())
 
     def cache_path(self, ref: ResourceRef) -> Path:
@@ -3,6 +3,7 @@ Registry of resources and tables, independent of configuration file format.
 """
 
 from argparse import ArgumentParser
+from dataclasses import dataclass, field
 from itertools import chain
 from typing import Type, Optional
 
@@ -33,13 +34,13 @@ class Registry:
 
     def get_schema(self, name: str) -> "Schema":
         """Return the schema object for a schema name, creating it if necessary."""
-        if name not in self.schemas:
-            self.schemas[name] = Schema(name=name)
-        return self.schemas[name]
+        if (schema := self.schemas.get(name)) is None:
+            schema = self.schemas[name] = Schema(name=name)
+        return schema
 
     def add_table(self, cls: type, **kwargs):
         """Register a class to define a table in Python; this is called by the @table decorator."""
-        t = TableDef(cls=cls, **kwargs)
+        t = TableDef(cls=cls, schema_name=kwargs.pop("schema"), **kwargs)
         self.get_schema(t.schema_name).builtin[t.name] = t
 
     def add_resource(self, cls: type, family: str, schema_defaults: list[str]):
@@ -114,22 +115,23 @@ class Resource(BaseModel):
         raise NotImplementedError(f"{self.__class__} must implement cache_path()")
 
 
-class Schema(BaseModel):
+@dataclass
+class Schema:
     """Collection of tables and resource definitions."""
     name: str
-    builtin: dict[str, TableDef] = {}
-    _create: dict[str, CreateTable] = {}
-    _extend: dict[str, ExtendTable] = {}
-    _resources: dict[str, Resource] = {}
+    builtin: dict[str, TableDef] = field(default_factory=dict)
+    _create: dict[str, CreateTable] = field(default_factory=dict, init=False)
+    _extend: dict[str, ExtendTable] = field(default_factory=dict, init=False)
+    _resources: dict[str, Resource] = field(default_factory=dict, init=False)
 
     def read_configs(self):
         """Apply the built-in and user configuration files for the schema, if present."""
         def _apply(path: ConfigPath):
-            if not path.exists():
-                return False
-            config, errors = parse_file(UserConfig, path)
+            config, errors = parse_file(UserConfig, path, default_if_missing=False)
             if errors:
                 fail("\n".join(errors))
+            if config is None:
+                return False
             self._create.update({c.table: c for c in config.create})
             self._extend.update({e.table: e for e in config.extend})
             self._resources.update({r.name: self._find_resource(r) for r in config.resources})
@@ -3,25 +3,34 @@ This is separate from engine.py for maintainability.
 SQLite tables are defined and populated here.
 """
 
+from dataclasses import dataclass, field
 from typing import Optional, Type
 
 import jmespath
-from pydantic import Field, BaseModel
 from tabulate import tabulate
 
 from .config import UserColumn, ExtendTable, CreateTable, Column
 from ..util import fail, debugging, abbreviate
 
 
-class TableDef(BaseModel):
+@dataclass
+class TableDef:
     """
     Capture a table definition from the @table decorator, example:
         @table(schema="kubernetes", name="pods", resource="pods")
     """
     cls: Type
     name: str
-    schema_name: str = Field(..., alias="schema")
+    schema_name: str
     resource: str
+    # Columns as returned by cls().columns(), computed on first use
+    _columns: Optional[list[Column]] = field(default=None, init=False, repr=False)
+
+    def columns(self, impl) -> list[Column]:
+        """Return the table's column definitions; these never change, so ask impl only once."""
+        if self._columns is None:
+            self._columns = impl.columns()
+        return self._columns
 
 
 class Table:
@@ -39,6 +48,10 @@ class Table:
         self.resource = resource
         self.builtin_columns = builtin_columns
         self.non_builtin_columns = non_builtin_columns
+        self.columns = builtin_columns + non_builtin_columns
+        # Column definitions and INSERT placeholders, for the CREATE and INSERT statements
+        self._ddl = ", ".join(f"{c.name} {c._sqltype}" for c in self.columns)
+        self._placeholders = ", ".join("?" * len(self.columns))
 
     def build(self, db, kube_data: dict, multi_schema: bool):
         """Create the table in SQLite and insert the data.
@@ -49,21 +62,18 @@ class Table:
         """
         context = RowContext(kube_data)
         table_name = f"{self.schema_name}.{self.name}" if multi_schema else self.name
-        ddl = ", ".join(f"{c.name} {c._sqltype}" for c in self.builtin_columns + self.non_builtin_columns)
-        db.execute(f"CREATE TABLE {table_name} ({ddl})")
-        item_rows = list(self.make_rows(context))
-        if item_rows:
-            if self.non_builtin_columns:
-                extend_row = lambda item, row: row + tuple(column.extract(item, context)
-                                                           for column in self.non_builtin_columns)
-            else:
-                extend_row = lambda item, row: row
-            rows = [extend_row(item, row) for item, row in item_rows]
-            placeholders = ", ".join("?" * len(rows[0]))
-            db.execute(f"INSERT INTO {table_name} VALUES({placeholders})", rows)
+        db.execute(f"CREATE TABLE {table_name} ({self._ddl})")
+        # Stream rows into SQLite as they're generated, rather than building a list of them.
+        # The item is only needed if there are columns from an extend: section.
+        if extra := self.non_builtin_columns:
+            rows = (row + tuple(column.extract(item, context) for column in extra)
+                    for item, row in self.make_rows(context))
+        else:
+            rows = (row for _, row in self.make_rows(context))
+        db.executemany(f"INSERT INTO {table_name} VALUES({self._placeholders})", rows)
 
     def printable_schema(self):
-        rows = [(c.name, c._sqltype, c.comment or "") for c in self.builtin_columns + self.non_builtin_columns]
+        rows = [(c.name, c._sqltype, c.comment or "") for c in self.columns]
         return f"## {self.name}\n" + tabulate(rows, tablefmt="plain")
 
 
@@ -76,8 +86,8 @@ class TableFromCode(Table):
         :param extender: an ExtendTable object from the extend: section of a user config file
         """
         self.impl = table_def.cls()
-        super().__init__(table_def.name, table_def.schema_name, table_def.resource, self.impl.columns(),
-                         extender.columns if extender else [])
+        super().__init__(table_def.name, table_def.schema_name, table_def.resource,
+                         table_def.columns(self.impl), extender.columns if extender else [])
 
     def make_rows(self, context: "RowContext") -> list[tuple[dict, tuple]]:
         """Delegate to the user-defined table implementation."""
@@ -7,7 +7,7 @@ from argparse import ArgumentParser
 import sys
 from sqlite3 import DatabaseError
 from types import SimpleNamespace
-from typing import List, Union
+from typing import List, Optional, Union
 
 from kugl.impl.registry import Registry
 from kugl.impl.engine import Engine, CHECK, NEVER_UPDATE, ALWAYS_UPDATE, CacheFlag
@@ -47,17 +47,21 @@ def main1(argv: List[str]):
     sys.exit(1)
 
 
-def main2(argv: List[str]):
+def main2(argv: List[str], init: Optional[UserInit] = None):
+    """
+    :param init: the parsed init file, if already loaded before a shortcut was expanded
+    """
 
     kugl_home().mkdir(exist_ok=True)
     if not argv:
         fail("Missing sql query")
 
     # Load init file.
-    init_file = ConfigPath(kugl_home() / "init.yaml")
-    init, errors = parse_file(UserInit, init_file)
-    if errors:
-        fail("\n".join(errors))
+    if init is None:
+        init_file = ConfigPath(kugl_home() / "init.yaml")
+        init, errors = parse_file(UserInit, init_file)
+        if errors:
+            fail("\n".join(errors))
 
     ap = ArgumentParser()
     Registry.get().augment_cli(ap)
@@ -71,7 +75,7 @@ def main2(argv: List[str]):
     if " " not in args.sql:
         if not (new_argv := init.shortcuts.get(argv[-1])):
             fail(f"No shortcut named '{argv[-1]}' is defined in ~/.kugl/init.yaml")
-        return main1(argv[:-1] + new_argv)
+        return main2(argv[:-1] + new_argv, init)
 
     if args.debug:
         debug_features(args.debug.split(","))
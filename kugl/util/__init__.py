@@ -2,8 +2,8 @@
 from .age import Age, parse_age, to_age
 from .clock import UNIT_TEST_TIMEBASE
 from .debug import debug_features, debugging, features_debugged
-from .misc import fail, KuglError, parse_utc, run, TABLE_NAME_RE, to_utc, warn, WHITESPACE_RE, cleave, abbreviate
-from .paths import KPath, ConfigPath, kugl_home, kube_home, kugl_cache, kube_context
+from .misc import fail, KuglError, parse_utc, run, TABLE_NAME_RE, to_utc, warn, cleave, abbreviate
+from .paths import KPath, ConfigPath, kugl_home, kube_home, kugl_cache, kube_context, yaml_load
 from .size import parse_size, to_size, parse_cpu
 from .sqlite import SqliteDb
 from .sqlparse import Query
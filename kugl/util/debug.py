@@ -36,10 +36,11 @@ def debugging(feature: str = None) -> Optional[Callable]:
 
     :return: A callable to print a message to stderr prefixed by the feature name, or
         None if the feature isn't being debugged."""
-    if feature is None:
-        if len(DEBUG_FLAGS) > 0:
-            return lambda *args: _dprint("all", args)
+    if not DEBUG_FLAGS:
+        # The usual case; this is called from many places so keep it cheap.
         return None
+    if feature is None:
+        return lambda *args: _dprint("all", args)
     if DEBUG_FLAGS.get(feature) or DEBUG_FLAGS.get("all"):
         return lambda *args: _dprint(feature, args)
     return None
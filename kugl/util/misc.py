@@ -1,42 +1,76 @@
 """
 Assorted utility functions / classes with no obvious home.
 """
+import datetime as dt
+from functools import lru_cache
 import json
 import re
 import subprocess as sp
 import sys
 from typing import Optional, Union, Callable, Tuple
 
-import arrow
-
 from .debug import debugging
 
-WHITESPACE_RE = re.compile(r"\s+")
 TABLE_NAME_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+# The one timestamp format used by Kubernetes, e.g. 2024-12-10T02:49:02Z
+K8S_TIMESTAMP_RE = re.compile(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ")
 
 
-def run(args: Union[str, list[str]], error_ok: bool = False) -> Tuple[int, str, str]:
+def run(args: Union[str, list[str]], error_ok: bool = False,
+        encoding: Optional[str] = "utf-8") -> Tuple[int, Union[str, bytes], str]:
     """
     Invoke an external command, which may be a list or a string; in the latter case it will be
     interpreted using bash -c.  Returns exit status, stdout and stderr.
+
+    :param encoding: How to decode stdout; if None, stdout is returned as bytes, which saves a
+        decoding pass when the output is going straight to a JSON parser.
     """
     if isinstance(args, str):
         args = ["bash", "-c", args]
     if debug := debugging("fetch"):
         debug(f"running {' '.join(args)}")
-    p = sp.run(args, stdout=sp.PIPE, stderr=sp.PIPE, encoding="utf-8")
+    if encoding is None:
+        p = sp.run(args, stdout=sp.PIPE, stderr=sp.PIPE)
+        stdout, stderr = p.stdout, p.stderr.decode("utf-8", errors="replace")
+    else:
+        p = sp.run(args, stdout=sp.PIPE, stderr=sp.PIPE, encoding=encoding)
+        stdout, stderr = p.stdout, p.stderr
     if p.returncode != 0 and not error_ok:
         print(f"failed to run [{' '.join(args)}]:", file=sys.stderr)
-        print(p.stderr, file=sys.stderr, end="")
+        print(stderr, file=sys.stderr, end="")
         sys.exit(p.returncode)
-    return p.returncode, p.stdout, p.stderr
+    return p.returncode, stdout, stderr
 
 
+# Pods created by the same rollout often share a creation timestamp, so this is worth caching.
+@lru_cache(maxsize=8192)
 def parse_utc(utc_str: str) -> int:
+    if isinstance(utc_str, str) and K8S_TIMESTAMP_RE.fullmatch(utc_str):
+        # Kubernetes timestamps are all in one format, which we can take apart much faster
+        # than arrow can.  The datetime constructor still rejects out-of-range fields.
+        return int(dt.datetime(int(utc_str[0:4]), int(utc_str[5:7]), int(utc_str[8:10]),
+                               int(utc_str[11:13]), int(utc_str[14:16]), int(utc_str[17:19]),
+                               tzinfo=dt.timezone.utc).timestamp())
+    # Other formats may appear in user-defined date columns.
+    if isinstance(utc_str, str):
+        # Same as arrow.get(utc_str), minus its per-call dispatch and parser construction.
+        parsed = _iso_parser().parse_iso(utc_str)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=dt.timezone.utc)
+        return int(parsed.timestamp())
+    import arrow
     return arrow.get(utc_str).int_timestamp
 
 
+@lru_cache(maxsize=1)
+def _iso_parser():
+    # arrow is imported on demand, since many invocations never need it.
+    from arrow.parser import DateTimeParser
+    return DateTimeParser()
+
+
 def to_utc(epoch: int) -> str:
+    import arrow
     return arrow.get(epoch).to('utc').format('YYYY-MM-DDTHH:mm:ss') + 'Z'
 
 
@@ -1,30 +1,74 @@
 from functools import cache
+import json
 import os
 from pathlib import Path
-
-import yaml
+import re
+from typing import Any, Callable, Optional
 
 from .age import Age
 from .debug import debugging
 from .misc import fail
 from ..util import clock as clock
 
+# A top-level current-context whose value is an unquoted plain scalar, which is what kubectl writes.
+# Like kubectl, we take that as a string, even if YAML would read it as e.g. a number.  Anything
+# fancier goes to the YAML parser.
+CURRENT_CONTEXT_RE = re.compile(r"^current-context:[ \t]*([\w.@:/-]*[\w.@/-])[ \t]*$", re.MULTILINE)
+
+# Parsed file content keyed by (path, mtime, size, format); see KPath._parse_cached
+_PARSE_CACHE: dict[tuple, Any] = {}
+_MISSING = object()
+# Current context keyed by (kubeconfig path, mtime, size)
+_KUBE_CONTEXT_CACHE: dict[tuple, str] = {}
+
+
+def yaml_load(text: str) -> Any:
+    """Parse YAML with the fastest available safe loader."""
+    if text.lstrip()[:1] in ("{", "["):
+        # Likely JSON, which is also YAML, but a JSON parser is far faster.  If it's actually
+        # a YAML flow mapping or sequence, e.g. {a: 1}, the YAML parser gets a turn.
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    yaml, loader = _yaml()
+    return yaml.load(text, Loader=loader)
+
+
+@cache
+def _yaml():
+    # PyYAML is imported on first use, since not every invocation reads YAML.
+    import yaml
+    # The LibYAML-based loader is much faster, but only present if PyYAML was built with it.
+    return yaml, getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class KPath(type(Path())):
     """It would be nice if Path were smarter, so do that."""
 
-    def is_world_writeable(self) -> bool:
-        return self.stat().st_mode & 0o2 == 0o2
+    # Methods taking an optional stat_result let the caller stat() the file once, up front.
+
+    def is_world_writeable(self, st: Optional[os.stat_result] = None) -> bool:
+        return (st or self.stat()).st_mode & 0o2 == 0o2
 
-    def parse_json(self):
-        return json.loads(self.read_text())
+    def parse_json(self, st: Optional[os.stat_result] = None):
+        return self._parse_cached("json", lambda: json.loads(self.read_text()), st)
 
-    def parse_yaml(self):
-        return yaml.safe_load(self.read_text())
+    def parse_yaml(self, st: Optional[os.stat_result] = None):
+        return self._parse_cached("yaml", lambda: yaml_load(self.read_text()), st)
+
+    def _parse_cached(self, kind: str, parse: Callable[[], Any], st: Optional[os.stat_result]):
+        """Parse the file, or return the previous result if the file hasn't changed since.
+        The result is shared between callers, so must not be modified."""
+        st = st or self.stat()
+        key = (str(self), st.st_mtime_ns, st.st_size, kind)
+        if (result := _PARSE_CACHE.get(key, _MISSING)) is _MISSING:
+            result = _PARSE_CACHE[key] = parse()
+        return result
 
     def set_age(self, age: Age):
         time = clock.CLOCK.now() - age.value
-        os.utime(str(self), times=(time, time))
+        os.utime(self, times=(time, time))
 
     def prep(self):
         super().mkdir(parents=True, exist_ok=True)
@@ -34,45 +78,65 @@ class KPath(type(Path())):
 class ConfigPath(KPath):
     """Same as a KPath but adds debug statements"""
 
-    def parse_json(self):
+    def parse_json(self, st: Optional[os.stat_result] = None):
         if debug := debugging("config"):
-            debug(f"loading {self}")
-        return super().parse_json()
+            debug("loading", self)
+        return super().parse_json(st)
 
-    def parse_yaml(self):
+    def parse_yaml(self, st: Optional[os.stat_result] = None):
         if debug := debugging("config"):
-            debug(f"loading {self}")
-        return super().parse_yaml()
+            debug("loading", self)
+        return super().parse_yaml(st)
+
+
+@cache
+def _home() -> KPath:
+    # Path.home() consults the environment and possibly the password database, so do that once.
+    return KPath.home()
 
 
+@cache
 def kugl_home() -> KPath:
     # KUGL_HOME override is for unit tests, not users
-    if "KUGL_HOME" in os.environ:
-        return KPath(os.environ["KUGL_HOME"])
-    return KPath.home() / ".kugl"
+    if (path := os.environ.get("KUGL_HOME")) is not None:
+        return KPath(path)
+    return _home() / ".kugl"
 
 
+@cache
 def kugl_cache() -> KPath:
     # KUGL_CACHE override is for unit tests, not users
-    if "KUGL_CACHE" in os.environ:
-        return KPath(os.environ["KUGL_CACHE"])
-    return KPath.home() / ".kuglcache"
+    if (path := os.environ.get("KUGL_CACHE")) is not None:
+        return KPath(path)
+    return _home() / ".kuglcache"
 
 
+@cache
 def kube_home() -> KPath:
     # KUGL_KUBE_HOME override is for unit tests, not for users (as least for now)
-    if "KUGL_KUBE_HOME" in os.environ:
-        return KPath(os.environ["KUGL_KUBE_HOME"])
-    return KPath.home() / ".kube"
+    if (path := os.environ.get("KUGL_KUBE_HOME")) is not None:
+        return KPath(path)
+    return _home() / ".kube"
 
 
-@cache
 def kube_context() -> str:
-    """Return the current kubernetes context."""
+    """Return the current kubernetes context.  This is remembered until the kubeconfig changes."""
     kube_config = kube_home() / "config"
-    if not kube_config.exists():
+    try:
+        st = kube_config.stat()
+    except (FileNotFoundError, NotADirectoryError):
         fail(f"Missing {kube_config}, can't determine current context")
-    current_context = (yaml.safe_load(kube_config.read_text()) or {}).get("current-context")
+    key = (str(kube_config), st.st_mtime_ns, st.st_size)
+    if (current_context := _KUBE_CONTEXT_CACHE.get(key)) is not None:
+        return current_context
+    text = kube_config.read_text()
+    # Kubeconfigs can be large, and we only want one value, so try to avoid a full YAML parse.
+    matches = CURRENT_CONTEXT_RE.findall(text)
+    if len(matches) == 1:
+        current_context = matches[0]
+    else:
+        current_context = (yaml_load(text) or {}).get("current-context")
     if not current_context:
         fail("No current context, please run kubectl config use-context ...")
+    current_context = _KUBE_CONTEXT_CACHE[key] = str(current_context)
     return current_context
@@ -4,6 +4,7 @@ Our entire interface to SQLite features is here.
 
 import collections as co
 import sqlite3
+from typing import Iterable
 
 from kugl.util import debugging
 
@@ -13,6 +14,10 @@ class SqliteDb:
     def __init__(self, target=None):
         self.target = target
         self.conn = sqlite3.connect(":memory:", check_same_thread=False) if target is None else None
+        if self.conn:
+            # Keep sorting / grouping scratch space off disk, like the data itself.  (The journal
+            # and sync settings are already moot for an in-memory database.)
+            self.conn.execute("PRAGMA temp_store = MEMORY")
 
     def query(self, sql, **kwargs):
         """
@@ -64,6 +69,21 @@ class SqliteDb:
             with sqlite3.connect(self.target) as conn:
                 self._execute(conn, sql, data or [])
 
+    def executemany(self, sql, rows: Iterable[tuple]):
+        """
+        Like execute, but for inserting many rows.  Rows may come from a generator; they are
+        consumed one at a time by SQLite, so they need never be collected into a list.
+        :param sql str: SQL statement
+        :param rows Iterable: Update args, one tuple per row
+        """
+        if debug := debugging("sqlite"):
+            debug(f"execute: {sql}")
+        if self.conn:
+            self.conn.cursor().executemany(sql, rows)
+        else:
+            with sqlite3.connect(self.target) as conn:
+                conn.cursor().executemany(sql, rows)
+
     def _execute(self, conn, sql, data):
         if len(data) > 0 and any(isinstance(data[0], x) for x in [list, tuple]):
             conn.cursor().executemany(sql, data)
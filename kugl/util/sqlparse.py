@@ -1,12 +1,22 @@
-from collections import deque
 from dataclasses import dataclass
+import os
+import re
 from typing import Optional
 
-import sqlparse
-from sqlparse.tokens import Name, Comment, Punctuation
-
 from kugl.util import fail, TABLE_NAME_RE, cleave
 
+# Just enough of a SQL tokenizer to find table names.  Strings, quoted names and comments must
+# be recognized so we don't find FROM or ';' inside them; everything else is a run of name
+# characters or a single character of punctuation.
+SQL_TOKEN_RE = re.compile(r"""
+      (?P<space>\s+)
+    | (?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+    | (?P<string>'(?:[^']|'')*'?)
+    | (?P<quoted>"(?:[^"]|"")*"?|`[^`]*`?|\[[^\]]*\]?)
+    | (?P<word>[\w@$]+)
+    | (?P<punct>.)
+""", re.VERBOSE | re.DOTALL)
+
 
 @dataclass(frozen=True)
 class NamedTable:
@@ -29,24 +39,33 @@ class NamedTable:
 class Tokens:
     """Hold a list of sqlparse tokens and provide a means to scan with or without skipping whitespace."""
 
-    def __init__(self, tokens):
-        self._unseen = deque(tokens)
+    def __init__(self, tokens, comment):
+        """
+        :param comment: sqlparse's Comment token type, passed in so sqlparse can be imported lazily
+        """
+        self._tokens = list(tokens)
+        self._index = 0
+        self._comment = comment
 
     def get(self, skip: bool = True):
         """
         Get the next token from the list, or None if there are no more.
         :param skip: Skip over whitespace and comments.
         """
-        while self._unseen:
-            token = self._unseen.popleft()
+        tokens, index, Comment = self._tokens, self._index, self._comment
+        while index < len(tokens):
+            token = tokens[index]
+            index += 1
             if skip and (token.is_whitespace or token.ttype is Comment):
                 continue
+            self._index = index
             return token
+        self._index = index
         return None
 
 
 class Query:
-    """Hold a SQL query + information parsed from it using sqlparse."""
+    """Hold a SQL query + information parsed from it."""
 
     def __init__(self, sql: str):
         self.sql = sql
@@ -60,22 +79,69 @@ class Query:
 
     def _scan(self):
         """Find table references."""
+        if os.environ.get("KUGL_SQLPARSE"):
+            # Use the original sqlparse-based scanner, in case this one gets something wrong.
+            return self._scan_sqlparse()
+
+        tokens = [(m.lastgroup, m.group()) for m in SQL_TOKEN_RE.finditer(self.sql)]
+        statements, in_statement, prev, index = 0, False, None, 0
+        while index < len(tokens):
+            kind, value = tokens[index]
+            index += 1
+            if kind == "space" or kind == "comment":
+                continue
+            if not in_statement:
+                statements += 1
+                in_statement = True
+            if value == ";":
+                in_statement = False
+            elif kind == "word" and prev != "." and value.upper() in ("FROM", "JOIN"):
+                index = self._scan_name(tokens, index)
+                value = None
+            prev = value
+        if statements != 1:
+            fail("query must contain exactly one statement")
+
+    def _scan_name(self, tokens: list[tuple[str, str]], index: int) -> int:
+        """Scan for a table name following FROM or JOIN and add it to self.named_tables.
+        Skip whitespace up to the name, but not within it, since the name parts should be adjacent.
+        If what follows isn't a name, e.g. a subquery, don't consume it.
+        :return: the index of the first token after the name"""
+        while index < len(tokens) and tokens[index][0] in ("space", "comment"):
+            index += 1
+        if index == len(tokens) or tokens[index][0] not in ("word", "quoted"):
+            return index
+        name = tokens[index][1]
+        index += 1
+        while index < len(tokens) and (tokens[index][0] in ("word", "quoted") or tokens[index][1] == "."):
+            name += tokens[index][1]
+            index += 1
+        self.named_tables.add(NamedTable(*cleave(name, ".", flip=True)))
+        return index
+
+    def _scan_sqlparse(self):
+        """Find table references using sqlparse."""
+        # Imported once here, not in the per-token methods, since sqlparse is only needed on this path.
+        import sqlparse
+        from sqlparse import tokens as ttypes
 
         statements = sqlparse.parse(self.sql)
         if len(statements) != 1:
             fail("query must contain exactly one statement")
-        tl = Tokens(statements[0].flatten())
+        tl = Tokens(statements[0].flatten(), ttypes.Comment)
 
         while (token := tl.get()) is not None:
             if not token.is_keyword:
                 continue
             keyword = token.value.upper()
             if keyword == "FROM" or keyword.endswith("JOIN"):
-                self._scan_table_name(tl)
+                self._scan_table_name(tl, ttypes)
 
-    def _scan_table_name(self, tl: Tokens):
+    def _scan_table_name(self, tl: Tokens, ttypes):
         """Scan for a table name following FROM or JOIN and add it to self.named_tables.
-        Don't skip whitespace, since the name parts should be adjacent."""
+        Don't skip whitespace, since the name parts should be adjacent.
+        :param ttypes: the sqlparse.tokens module"""
+        Name, Punctuation = ttypes.Name, ttypes.Punctuation
         if (token := tl.get()) is None:
             return
         name = token.value
@@ -1,13 +1,14 @@
 
-from copy import deepcopy
+from functools import cache
 import os
 from pathlib import Path
 from typing import Union
 
+import orjson
 import pytest
 import yaml
 
-from kugl.util import UNIT_TEST_TIMEBASE, kube_home, clock, KPath, kube_context, kugl_home
+from kugl.util import UNIT_TEST_TIMEBASE, kube_home, clock, KPath, kugl_home, kugl_cache, yaml_load
 
 # Add tests/ folder to $PATH so running 'kubectl ...' invokes our mock, not the real kubectl.
 os.environ["PATH"] = f"{Path(__file__).parent}:{os.environ['PATH']}"
@@ -26,24 +27,39 @@ def pytest_sessionstart(session):
 
 @pytest.fixture(scope="function")
 def test_home(tmp_path, monkeypatch):
-    # Suppress memoization
-    kube_context.cache_clear()
     # Put all the folders where we find config data under the temp folder.
     monkeypatch.setenv("KUGL_HOME", str(tmp_path / "home"))
     monkeypatch.setenv("KUGL_CACHE", str(tmp_path / "cache"))
     monkeypatch.setenv("KUGL_KUBE_HOME", str(tmp_path / "kube"))
     monkeypatch.setenv("KUGL_MOCKDIR", str(tmp_path / "results"))
+    # Suppress memoization
+    clear_path_caches()
     # Write a fake kubeconfig file so we don't have to mock it.
     # A specific unit test will test proper behavior when it's absent.
     # The other folders are Kugl-owned, so we should verify they're auto-created when appropriate.
     kube_home().prep().joinpath("config").write_text("current-context: nocontext")
     yield KPath(tmp_path)
+    clear_path_caches()
+
+
+@pytest.fixture(scope="function")
+def fresh_path_caches():
+    """For tests that change the environment behind the memoized paths without using test_home."""
+    clear_path_caches()
+    yield
+    clear_path_caches()
+
+
+def clear_path_caches():
+    """Forget memoized paths, for tests that change the environment variables behind them."""
+    for func in [kugl_home, kugl_cache, kube_home]:
+        func.cache_clear()
 
 
 class HRData:
     """A utility class with simple schema configuration and data for unit tests."""
 
-    CONFIG = yaml.safe_load("""
+    CONFIG_YAML = """
         resources: 
           - name: people
             # Start this out as a data resource; a unit test can turn it into another
@@ -63,7 +79,7 @@ class HRData:
               - name: age
                 path: age
                 type: integer
-    """)
+    """
 
     PEOPLE_QUERY = "SELECT name, age FROM hr.people ORDER BY age"
     PEOPLE_RESULT = """
@@ -72,11 +88,18 @@ class HRData:
         Jill       43
     """
 
+    @classmethod
+    @cache
+    def _parsed(cls) -> dict:
+        """Parse the default HR configuration on first use; not every test needs it."""
+        return yaml_load(cls.CONFIG_YAML)
+
     def config(self):
-        """Return a deepcopy of the default HR configuration, for customization in a test."""
-        return deepcopy(self.CONFIG)
+        """Return a copy of the default HR configuration, for customization in a test."""
+        # A JSON round trip is a faster deep copy than copy.deepcopy, for plain data.
+        return orjson.loads(orjson.dumps(self._parsed()))
 
-    def save(self, config: Union[str, dict] = CONFIG):
+    def save(self, config: Union[str, dict] = CONFIG_YAML):
         """Write a (possibly modified) HR schema configuration to KUGL_HOME."""
         if not isinstance(config, str):
             config = yaml.dump(config)
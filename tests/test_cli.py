@@ -10,7 +10,7 @@ import pytest
 from kugl.impl.config import Settings
 from kugl.impl.engine import CHECK, ALWAYS_UPDATE, NEVER_UPDATE
 from kugl.main import main1, parse_args
-from kugl.util import KuglError, Age, kugl_home
+from kugl.util import KuglError, Age, kugl_home, features_debugged
 
 
 def test_enforce_one_cache_option(test_home):
@@ -72,9 +72,12 @@ def test_simple_shortcut(test_home, capsys):
         shortcuts:
           foo: ["select 1, 2"]
     """)
-    main1(["foo"])
-    out, _ = capsys.readouterr()
+    with features_debugged("config"):
+        main1(["foo"])
+    out, err = capsys.readouterr()
     assert out == "  1    2\n" * 2
+    # Init file shouldn't be reloaded after shortcut expansion
+    assert err.count("init.yaml") == 1
 
 
 @pytest.mark.parametrize("argv,expected_flag,age,reckless,error", [
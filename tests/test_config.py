@@ -3,12 +3,12 @@ Tests for user configuration file content.
 """
 import pytest
 
-from kugl.impl.config import Settings, UserConfig, parse_model, ExtendTable, CreateTable, UserInit
+from kugl.impl.config import Settings, UserConfig, parse_model, ExtendTable, CreateTable, UserInit, parse_file
 
 import yaml
 
 from kugl.main import main1
-from kugl.util import Age, kugl_home, KuglError
+from kugl.util import Age, kugl_home, KuglError, ConfigPath
 
 
 def test_settings_defaults():
@@ -149,4 +149,21 @@ def test_must_specify_path_or_label():
         columns:
           - name: foo
     """))
-    assert errors == ["columns.0: Value error, must specify either path or label"]
\ No newline at end of file
+    assert errors == ["columns.0: Value error, must specify either path or label"]
+
+
+def test_misspelled_field():
+    """Verify user config is still validated, so a misspelled or missing field is reported."""
+    _, errors = parse_model(CreateTable, yaml.safe_load("""
+        tabel: xyz
+        resource: xyz
+    """))
+    assert set(errors) == {"table: Field required", "tabel: Extra inputs are not permitted"}
+
+
+def test_parse_missing_file(test_home):
+    """A missing config file gives a default model, unless the caller asks to be told."""
+    path = ConfigPath(kugl_home() / "missing.yaml")
+    config, errors = parse_file(UserConfig, path)
+    assert config == UserConfig() and errors is None
+    assert parse_file(UserConfig, path, default_if_missing=False) == (None, None)
@@ -12,7 +12,7 @@ from kugl.util.clock import RealClock, Clock
 
 from kugl.builtins.helpers import Limits, Containerized
 from kugl.main import main1
-from kugl.util import Age, KuglError, kube_home, kugl_home, features_debugged, debugging, run, kube_context
+from kugl.util import Age, KuglError, kube_home, kugl_home, features_debugged, debugging, run, kube_context, KPath
 
 
 def test_limits_misc(capsys):
@@ -48,13 +48,13 @@ def test_enforce_mockdir(test_home, monkeypatch):
         main1(["select 1"])
 
 
-def test_kube_home_without_envar(monkeypatch):
+def test_kube_home_without_envar(monkeypatch, fresh_path_caches):
     monkeypatch.setenv("KUGL_KUBE_HOME", "xxx")  # must exist before deleting
     monkeypatch.delenv("KUGL_KUBE_HOME")
     assert kube_home() == Path.home() / ".kube"
 
 
-def test_kugl_home_without_envar(monkeypatch):
+def test_kugl_home_without_envar(monkeypatch, fresh_path_caches):
     monkeypatch.setenv("KUGL_HOME", "xxx")  # must exist before deleting
     monkeypatch.delenv("KUGL_HOME")
     assert kugl_home() == Path.home() / ".kugl"
@@ -81,6 +81,11 @@ def test_run_single_string_command():
     assert (rc, out, err) == (0, "", "hello world\n")
 
 
+def test_run_bytes_output():
+    rc, out, err = run(["echo", "hello world"], encoding=None)
+    assert (rc, out, err) == (0, b"hello world\n", "")
+
+
 def test_run_nonzero_returncode(capsys):
     rc, out, err = run("echo foo; false", error_ok=True)
     assert (rc, out, err) == (1, "foo\n", "")
@@ -116,3 +121,48 @@ def test_base_clock():
         clock.sleep(0)
     with pytest.raises(NotImplementedError):
         clock.is_simulated
+
+
+@pytest.mark.parametrize("config,context", [
+    ("current-context: nocontext", "nocontext"),
+    ("apiVersion: v1\ncurrent-context: arn:aws:eks:us-west-2:1234:cluster/prod  \nkind: Config", "arn:aws:eks:us-west-2:1234:cluster/prod"),
+    ("current-context: 'quoted'", "quoted"),
+    ('current-context: "with space"  # comment', "with space"),
+    ("current-context: 12", "12"),
+    ("current-context: 0x1F", "0x1F"),
+    ("current-context: 1_000", "1_000"),
+    ("current-context: 12:30", "12:30"),
+    ("current-context: 2024-01-01", "2024-01-01"),
+    ("current-context: .inf", ".inf"),
+    ("current-context: true", "true"),
+    ("current-context: 12  # comment", "12"),
+    ("contexts:\n- name: foo\n  current-context: bar\ncurrent-context: baz", "baz"),
+])
+def test_kube_context_parsing(test_home, config, context):
+    kube_home().prep().joinpath("config").write_text(config)
+    assert kube_context() == context
+
+
+def test_parse_cache(tmp_path):
+    """Verify repeat parses of an unchanged file come from cache, and changes are seen."""
+    path = KPath(tmp_path / "x.yaml")
+    path.write_text("a: 1")
+    first = path.parse_yaml()
+    assert first == {"a": 1}
+    assert path.parse_yaml() is first
+    path.write_text("a: 22")
+    assert path.parse_yaml() == {"a": 22}
+
+
+def test_kube_context_change(test_home):
+    """Verify a change to the kubeconfig is noticed."""
+    config = kube_home().prep().joinpath("config")
+    assert kube_context() == "nocontext"
+    config.write_text("current-context: other")
+    assert kube_context() == "other"
+
+
+def test_parse_json(tmp_path):
+    path = KPath(tmp_path / "x.json")
+    path.write_text('{"a": [1, "é"]}')
+    assert path.parse_json() == {"a": [1, "é"]}
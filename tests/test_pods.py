@@ -2,6 +2,9 @@
 Tests for the pods table.
 """
 
+import os
+from pathlib import Path
+
 import pytest
 
 from kugl.builtins.helpers import PodHelper
@@ -167,3 +170,73 @@ def test_pod_labels(test_home):
         uid-pod-4  one    two
         uid-pod-4  three  four
     """)
+
+
+def test_pod_status_failure(test_home, capsys):
+    """Verify a failure to get pod statuses isn't lost in the background fetch."""
+    kubectl_response("pods", {"items": [make_pod("pod-1")]})
+    with pytest.raises(SystemExit):
+        assert_query("SELECT name FROM pods", "")
+    out, err = capsys.readouterr()
+    assert "failed to run [kubectl get pods -n default]" in err
+
+
+def test_pod_status_full_listing(test_home):
+    """Verify pod status parsing with all the columns 'kubectl get pods' really prints."""
+    kubectl_response("pods", {"items": [make_pod("pod-1"), make_pod("pod-2")]})
+    kubectl_response("pod_statuses", """
+        NAME    READY   STATUS             RESTARTS        AGE
+        pod-1   1/1     Running            0               5d
+        pod-2   0/1     CrashLoopBackOff   12 (3m4s ago)   2d
+    """)
+    assert_query("SELECT name, status FROM pods ORDER BY name", """
+        name    status
+        pod-1   Running
+        pod-2   CrashLoopBackOff
+    """)
+
+
+def test_pod_status_blank_lines(test_home):
+    """Verify blank and whitespace-only lines in the 'kubectl get pods' listing are ignored."""
+    kubectl_response("pods", {"items": [make_pod("pod-1"), make_pod("pod-2")]})
+    # Not via kubectl_response, which would trim the leading and trailing lines.
+    Path(os.environ["KUGL_MOCKDIR"], "pod_statuses").write_text(
+        "\nNAME    READY   STATUS    RESTARTS       AGE\n"
+        "pod-1   1/1     Running   0              5d\n"
+        "\n"
+        "pod-2   0/1     Error     3 (1m ago)     2d\n"
+        "   \n"
+    )
+    assert_query("SELECT name, status FROM pods ORDER BY name", """
+        name    status
+        pod-1   Running
+        pod-2   Error
+    """)
+
+
+def test_resources_without_containers():
+    """A pod with no containers has no requests or limits, rather than failing."""
+    pod = PodHelper(make_pod("pod-1", containers=[]))
+    assert pod.resources("requests").as_tuple() == (None, None, None)
+
+
+@pytest.mark.parametrize("container,expected", [
+    (Container(), {
+        "name": "main", "command": ["echo", "hello"],
+        "resources": {"requests": {"cpu": 1, "memory": "10M"}, "limits": {"cpu": 1, "memory": "10M"}},
+    }),
+    (Container(name="app", command=["sleep"], requests=CGM(gpu=2, cpu="500m"), limits=None), {
+        "name": "app", "command": ["sleep"],
+        "resources": {"requests": {"cpu": "500m", "nvidia.com/gpu": 2}, "limits": None},
+    }),
+    (Container(requests=CGM(), limits=CGM(mem="1Gi")), {
+        "name": "main", "command": ["echo", "hello"],
+        "resources": {"requests": {}, "limits": {"memory": "1Gi"}},
+    }),
+])
+def test_container_to_k8s_dict(container, expected):
+    """Verify the test helper's container layout, key order included, since extract debug output shows it."""
+    actual = container.to_k8s_dict()
+    assert actual == expected
+    for tag in ["requests", "limits"]:
+        assert list(actual["resources"][tag] or {}) == list(expected["resources"][tag] or {})
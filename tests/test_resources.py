@@ -4,10 +4,13 @@ Unit tests for the different built-in resource types.
 import io
 import json
 import sys
+from types import SimpleNamespace
 
 import pytest
 
-from kugl.util import KuglError, kugl_home, features_debugged, kugl_cache
+from kugl.impl.config import Settings
+from kugl.impl.engine import Engine, ALWAYS_UPDATE, NEVER_UPDATE
+from kugl.util import KuglError, kugl_home, features_debugged, kugl_cache, Query
 from tests.testing import assert_query, assert_by_line
 
 
@@ -128,4 +131,34 @@ def test_exec_cacheable(hr, monkeypatch):
         assert_query(hr.PEOPLE_QUERY, hr.PEOPLE_RESULT)
     # Verify the cache data was written
     cache_path = kugl_cache() / "hr/abc/xyz/people.exec.json"
-    assert cache_path.read_text() == people_data
\ No newline at end of file
+    assert cache_path.read_text() == people_data
+
+
+def test_exec_cacheable_nan(hr, monkeypatch):
+    """Cached exec output with values JSON can't strictly represent should read back from the cache."""
+    config = hr.config()
+    command = "printf 'items:\\n  - name: Jim\\n    age: .nan\\n  - name: Jill\\n    age: 43\\n'"
+    config["resources"][0] = dict(name="people", exec=command, cacheable="true", cache_key="$SOME_VAR/xyz")
+    config["create"][0]["columns"][1]["type"] = "real"
+    monkeypatch.setenv("SOME_VAR", "abc")
+    hr.save(config)
+    engine = Engine(SimpleNamespace(all_namespaces=False, namespace=None), ALWAYS_UPDATE, Settings())
+    fetched, _ = engine.query(Query(hr.PEOPLE_QUERY))
+    # Read it back from the cache this time
+    engine = Engine(SimpleNamespace(all_namespaces=False, namespace=None), NEVER_UPDATE, Settings(reckless=True))
+    cached, _ = engine.query(Query(hr.PEOPLE_QUERY))
+    assert cached == fetched == [["Jim", None], ["Jill", 43]]
+
+
+@pytest.mark.parametrize("kind", ["exec", "file"])
+def test_flow_mapping_resource(hr, test_home, kind):
+    """Resource output that looks like JSON but is really YAML should still parse."""
+    config = hr.config()
+    path = test_home / "people.yaml"
+    path.write_text("{items: [{name: Jim, age: 42}, {name: Jill, age: 43}]}")
+    if kind == "exec":
+        config["resources"][0] = dict(name="people", exec=f"cat {path}")
+    else:
+        config["resources"][0] = dict(name="people", file=str(path))
+    hr.save(config)
+    assert_query(hr.PEOPLE_QUERY, hr.PEOPLE_RESULT)
@@ -11,9 +11,14 @@ from kugl.util import KuglError, SqliteDb, Query
     ("""select xyz from pods""", ["pods"], None),
     ("""select xyz from pods left outer join nodes""", ["pods", "nodes"], None),
     ("""select xyz from my.pods a join his.nodes b""", ["my.pods", "his.nodes"], None),
+    ("""select 1; -- done""", [], None),
+    ("""select 'from x' from pods""", ["pods"], None),
 ])
-def test_schema_extraction(sql, refs: list[str], error: Optional[str]):
-    """Verify extraction of Kugl schemas from SQL queries."""
+@pytest.mark.parametrize("use_sqlparse", [False, True])
+def test_schema_extraction(sql, refs: list[str], error: Optional[str], use_sqlparse, monkeypatch):
+    """Verify extraction of Kugl schemas from SQL queries, with either scanner."""
+    if use_sqlparse:
+        monkeypatch.setenv("KUGL_SQLPARSE", "1")
     if error is not None:
         with pytest.raises(KuglError, match=error):
             Query(sql)
@@ -22,6 +27,19 @@ def test_schema_extraction(sql, refs: list[str], error: Optional[str]):
         assert set(refs) == set(str(nt) for nt in q.named_tables)
 
 
+@pytest.mark.parametrize("sql,refs", [
+    ("""select * from -- comment
+        pods""", ["pods"]),
+    ("""select * from (select * from my.pods) p join nodes""", ["my.pods", "nodes"]),
+    ("""select p.from, x.join from pods p""", ["pods"]),
+])
+def test_schema_extraction_edge_cases(sql, refs: list[str], monkeypatch):
+    """Cases the regex scanner handles that the sqlparse scanner doesn't (or handles differently)."""
+    monkeypatch.delenv("KUGL_SQLPARSE", raising=False)
+    q = Query(sql)
+    assert set(refs) == set(str(nt) for nt in q.named_tables)
+
+
 def test_multiple_sqlite_dbs():
     """Verify we can directly map Kugl schemas to SQLite databases.
     This is huge; it means no transforms on SQL queries are needed."""
@@ -43,4 +61,12 @@ def test_multiple_sqlite_dbs():
         FROM t 
             JOIN a.t AS a ON a.name = t.name
             JOIN b.t AS b ON b.name = t.name
-    """, one_row=True)
\ No newline at end of file
+    """, one_row=True)
+
+
+def test_executemany_from_generator():
+    """Verify rows can be streamed into SQLite without building a list."""
+    db = SqliteDb()
+    db.execute("create table t (x int, name text)")
+    db.executemany("insert into t values (?, ?)", ((i, f"row{i}") for i in range(3)))
+    assert db.query("select x, name from t order by x") == [(0, "row0"), (1, "row1"), (2, "row2")]
@@ -2,10 +2,11 @@
 More assorted tests, should these be combined with test_misc.py?
 """
 
+import arrow
 import jmespath
 import pytest
 
-from kugl.util import Age, parse_size, to_size, debugging, debug_features, parse_cpu
+from kugl.util import Age, parse_size, to_size, debugging, debug_features, parse_cpu, parse_utc, yaml_load
 
 
 @pytest.mark.parametrize("input_args,input_kwargs,expected", [
@@ -112,6 +113,25 @@ def test_to_size(args: tuple, result: str):
     assert to_size(*args) == result
 
 
+@pytest.mark.parametrize("utc_str", [
+    "2024-12-10T02:49:02Z",
+    "1970-01-01T00:00:00Z",
+    "2024-02-29T23:59:59Z",
+    "2021-01-01",
+    "2021-12-31T23:59:59+02:00",
+    "2021-12-31 23:59:59",
+    "2021-12-31T23:59:59.250Z",
+])
+def test_parse_utc(utc_str):
+    """The fast paths for Kubernetes and other ISO timestamps must agree with arrow."""
+    assert parse_utc(utc_str) == arrow.get(utc_str).int_timestamp
+
+
+def test_parse_utc_invalid():
+    with pytest.raises(ValueError):
+        parse_utc("2024-13-10T02:49:02Z")
+
+
 def test_jmespath_performance():
     """
     JMESPath performance regression test.  We use JMESPath to filter and transform
@@ -142,4 +162,17 @@ def test_debug(capsys):
     debugging(FEATURE)("hello", "there")
     assert capsys.readouterr().err == "afeature: hello there\n"
     debug_features([FEATURE], False)
-    assert debugging(FEATURE) is None
\ No newline at end of file
+    assert debugging(FEATURE) is None
+
+
+@pytest.mark.parametrize("text,expected", [
+    ('{"a": [1, 2]}', {"a": [1, 2]}),
+    ('  [1, "x"]', [1, "x"]),
+    ("{a: 1}", {"a": 1}),
+    ("[a, b]", ["a", "b"]),
+    ("a: 1", {"a": 1}),
+    ("", None),
+])
+def test_yaml_load(text, expected):
+    """Verify JSON-looking text parses the same whether it's really JSON or YAML."""
+    assert yaml_load(text) == expected
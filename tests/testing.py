@@ -2,22 +2,18 @@
 Common utilities for unit testing.
 """
 
-import json
 import os
 import re
 import textwrap
+from dataclasses import dataclass, field
 from functools import cache
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Optional, Tuple, Union, List
 
-import yaml
-from pydantic import Field, BaseModel, ConfigDict
+import orjson
 
-from kugl.impl.config import Settings
-from kugl.impl.engine import Engine, Query, ALWAYS_UPDATE
-from kugl.impl.registry import Registry
-from kugl.util import to_utc, UNIT_TEST_TIMEBASE
+from kugl.util import to_utc, UNIT_TEST_TIMEBASE, Query, yaml_load
 
 
 def kubectl_response(kind: str, output: Union[str, dict]):
@@ -28,42 +24,66 @@ def kubectl_response(kind: str, output: Union[str, dict]):
     :param output: A dict (will be JSON-serialized) or a string (will be trimmed)
     """
     if isinstance(output, dict):
-        output = json.dumps(output)
+        output = orjson.dumps(output)
     else:
-        output = str(output).strip()
-    folder = Path(os.getenv("KUGL_MOCKDIR"))
+        output = str(output).strip().encode()
+    _mockdir(os.getenv("KUGL_MOCKDIR")).joinpath(kind).write_bytes(output)
+
+
+@cache
+def _mockdir(path: str) -> Path:
+    """Create the mock responses folder on first use; this is keyed by path since each test has its own."""
+    folder = Path(path)
     folder.mkdir(exist_ok=True)
-    folder.joinpath(kind).write_text(output)
+    return folder
 
 
-class Taint(BaseModel):
+@dataclass
+class Taint:
     """Helper class for creating taints in test nodes"""
     key: str
     effect: str
     value: Optional[str] = None
 
+    def to_k8s_dict(self) -> dict:
+        """Return the taint as it appears in a node spec."""
+        result = dict(key=self.key, effect=self.effect)
+        if self.value is not None:
+            result["value"] = self.value
+        return result
+
 
-class CGM(BaseModel):
+@dataclass
+class CGM:
     """Helper class for creating CPU/GPU/Memory resources in test containers"""
-    model_config = ConfigDict(populate_by_name=True)
     cpu: Union[int, str, None] = None
-    mem: Union[int, str, None] = Field(None, alias="memory")
-    gpu: Union[int, str, None] = Field(None, alias="nvidia.com/gpu")
+    mem: Union[int, str, None] = None
+    gpu: Union[int, str, None] = None
 
+    def to_k8s_dict(self) -> dict:
+        """Return the resources as they appear in a container spec, omitting those not set."""
+        return {key: value for key, value in (("cpu", self.cpu), ("memory", self.mem), ("nvidia.com/gpu", self.gpu))
+                if value is not None}
 
-class Container(BaseModel):
+
+@dataclass
+class Container:
     """Helper class for creating containers in test pods"""
     name: str = "main"
-    command: List[str] = Field(default_factory = lambda: ["echo", "hello"])
-    requests: Optional[CGM] = CGM(cpu=1, mem="10M")
-    limits: Optional[CGM] = CGM(cpu=1, mem="10M")
-    # Don't specify this in the constructor, it's a derived field
-    resources: Optional[dict[str, CGM]] = None
+    command: List[str] = field(default_factory=lambda: ["echo", "hello"])
+    requests: Optional[CGM] = field(default_factory=lambda: CGM(cpu=1, mem="10M"))
+    limits: Optional[CGM] = field(default_factory=lambda: CGM(cpu=1, mem="10M"))
 
-    def model_post_init(self, *args):
-        # Move requests and limits to resources so they match the Pod layout.
-        self.resources = dict(requests=self.requests, limits=self.limits)
-        self.requests = self.limits = None
+    def to_k8s_dict(self) -> dict:
+        """Return the container as it appears in a pod spec."""
+        return {
+            "name": self.name,
+            "command": list(self.command),
+            "resources": {
+                "requests": None if self.requests is None else self.requests.to_k8s_dict(),
+                "limits": None if self.limits is None else self.limits.to_k8s_dict(),
+            },
+        }
 
 
 def make_node(name: str, taints: Optional[List[Taint]] = None, labels: Optional[dict] = None):
@@ -72,13 +92,14 @@ def make_node(name: str, taints: Optional[List[Taint]] = None, labels: Optional[
     responses from the K8S API.
     :param name: Node name
     """
-    node = yaml.safe_load(_resource_content("sample_node.yaml"))
-    node["metadata"]["name"] = name
-    node["metadata"]["uid"] = "uid-" + name
+    node = _clone(_parsed_resource("sample_node.yaml"))
+    meta = node["metadata"]
+    meta["name"] = name
+    meta["uid"] = f"uid-{name}"
     if taints:
-        node["spec"]["taints"] = [taint.model_dump(exclude_none=True) for taint in taints]
+        node["spec"]["taints"] = [taint.to_k8s_dict() for taint in taints]
     if labels is not None:
-        node["metadata"]["labels"] = labels
+        meta["labels"] = labels
     return node
 
 
@@ -90,7 +111,7 @@ def make_pod(name: str,
              creation_ts: int = UNIT_TEST_TIMEBASE,
              namespace: Optional[str] = None,
              node_name: Optional[str] = None,
-             containers: List[Container] = [Container()],
+             containers: Optional[List[Container]] = None,
              labels: Optional[dict] = None,
              phase: Optional[str] = "Running",
              ):
@@ -101,26 +122,31 @@ def make_pod(name: str,
     :param no_metadata: Pretend there is no metadata
     :param name_at_root: Put the object name at top level, not in the metadata
     :param no_name: Pretend there is no object name
+    :param containers: Containers for the pod spec; default is one Container()
     """
-    obj = yaml.safe_load(_resource_content("sample_pod.yaml"))
+    obj = _clone(_parsed_resource("sample_pod.yaml"))
+    meta, spec = obj["metadata"], obj["spec"]
     if name_at_root:
         obj["name"] = name
     elif not no_name:
-        obj["metadata"]["name"] = name
-    obj["metadata"]["uid"] = "uid-" + name
-    if no_metadata:
-        del obj["metadata"]
+        meta["name"] = name
+    meta["uid"] = f"uid-{name}"
     if is_daemon:
-        obj["metadata"]["ownerReferences"] = [{"kind": "DaemonSet"}]
+        meta["ownerReferences"] = [{"kind": "DaemonSet"}]
     if namespace:
-        obj["metadata"]["namespace"] = namespace
-    if node_name:
-        obj["spec"]["nodeName"] = node_name
+        meta["namespace"] = namespace
     if labels is not None:
-        obj["metadata"]["labels"] = labels
-    if creation_ts and not no_metadata:
-        obj["metadata"]["creationTimestamp"] = to_utc(creation_ts)
-    obj["spec"]["containers"] = [c.model_dump(by_alias=True, exclude_none=True) for c in containers]
+        meta["labels"] = labels
+    if creation_ts:
+        meta["creationTimestamp"] = to_utc(creation_ts)
+    if no_metadata:
+        del obj["metadata"]
+    if node_name:
+        spec["nodeName"] = node_name
+    if containers is None:
+        spec["containers"] = [_clone(_default_container())]
+    else:
+        spec["containers"] = [c.to_k8s_dict() for c in containers]
     obj["status"]["phase"] = phase
     return obj
 
@@ -141,18 +167,19 @@ def make_job(name: str,
     :param condition: If present, a condition tuple (type, status, reason)
     :param: pod: If present, a pod dict to be used as the template, returned from make_pod
     """
-    obj = yaml.safe_load(_resource_content("sample_job.yaml"))
-    obj["metadata"]["name"] = name
-    obj["metadata"]["uid"] = "uid-" + name
-    obj["metadata"]["labels"]["job-name"] = name
+    obj = _clone(_parsed_resource("sample_job.yaml"))
+    meta, status = obj["metadata"], obj["status"]
+    meta["name"] = name
+    meta["uid"] = f"uid-{name}"
+    meta["labels"]["job-name"] = name
     if namespace is not None:
-        obj["metadata"]["namespace"] = namespace
+        meta["namespace"] = namespace
     if active_count is not None:
-        obj["status"]["active"] = active_count
+        status["active"] = active_count
     if condition is not None:
-        obj["status"]["conditions"] = [{"type": condition[0], "status": condition[1], "reason": condition[2]}]
+        status["conditions"] = [{"type": condition[0], "status": condition[1], "reason": condition[2]}]
     if labels is not None:
-        obj["metadata"]["labels"] = labels
+        meta["labels"] = labels
     if pod is not None:
         obj["spec"]["template"]["spec"] = pod["spec"]
     return obj
@@ -166,13 +193,16 @@ def assert_query(sql: str, expected: Union[str, list], all_ns: bool = False):
         caller can indent for neatness.  Or, if a list, each item will be checked in order.
     :param all_ns: FIXME temporary hack until we get namespaces out of engine.py
     """
+    # Imported here so that tests using only the fixture builders don't load the engine.
+    from kugl.impl.config import Settings
+    from kugl.impl.engine import Engine, ALWAYS_UPDATE
     args = SimpleNamespace(all_namespaces=all_ns, namespace=None)
     engine = Engine(args, ALWAYS_UPDATE, Settings())
     if isinstance(expected, str):
-        actual = engine.query_and_format(Query(sql))
-        assert actual.strip() == textwrap.dedent(expected).strip()
+        actual = engine.query_and_format(_query(sql))
+        assert actual.strip() == _dedent(expected)
     else:
-        actual, _ = engine.query(Query(sql))
+        actual, _ = engine.query(_query(sql))
         assert actual == expected
 
 
@@ -187,14 +217,48 @@ def assert_by_line(lines: Union[str, list[str]], expected: Union[str, list[Union
         lines = lines.strip().splitlines()
     if isinstance(expected, str):
         # Must be dedented because assertions are written with indent
-        expected = textwrap.dedent(expected).strip().splitlines()
-    for line, exp, index in zip(lines, expected, range(len(expected))):
+        expected = _dedent(expected).splitlines()
+    if all(isinstance(exp, str) for exp in expected):
+        # The common case; compare all at once, and only walk the lines to describe a mismatch.
+        actual = [line.strip() for line in lines[:len(expected)]]
+        if actual == [exp.strip() for exp in expected[:len(actual)]]:
+            return
+    for index, (line, exp) in enumerate(zip(lines, expected)):
         if isinstance(exp, str):
             assert line.strip() == exp.strip(), f"Line {index}: {line.strip()} != {exp.strip()}"
         else:
             assert exp.match(line.strip()), f"Did not find {exp.pattern} in {line.strip()}"
 
 
+@cache
+def _default_container() -> dict:
+    """The container layout most test pods use; callers must copy it before changing it."""
+    return Container().to_k8s_dict()
+
+
+@cache
+def _query(sql: str):
+    """Scan a query once; the engine only reads it, so the same object can serve repeat asserts."""
+    return Query(sql)
+
+
+@cache
+def _dedent(text: str) -> str:
+    """Dedent and strip expected output; tests often repeat the same literal."""
+    return textwrap.dedent(text).strip()
+
+
 @cache
 def _resource_content(filename: str):
-    return Path(__file__).parent.joinpath("resources", filename).read_text()
\ No newline at end of file
+    return Path(__file__).parent.joinpath("resources", filename).read_text()
+
+
+@cache
+def _parsed_resource(filename: str):
+    """Parse a sample resource once; callers must copy the result before changing it."""
+    return yaml_load(_resource_content(filename))
+
+
+def _clone(obj):
+    """Deep-copy JSON-compatible data, which is much faster through orjson than copy.deepcopy."""
+    return orjson.loads(orjson.dumps(obj))
\ No newline at end of file